@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+import hashlib
+import io
 import re
 from datetime import datetime
 
@@ -18,76 +20,95 @@ BAD_WORDS = [
 # Common phonetic prank combinations
 PRANK_COMBOS = ["ben dover", "eileen ulick", "barry mc", "mike litoris", "hugh j"]
 
+# Gibberish: 6+ consonants in a row like 'asdfghj'
+GIBBERISH = r'[bcdfghjklmnpqrstvwxyz]{6,}'
+
+# One precompiled alternation covers every blacklist word, prank combo and
+# gibberish run, so the row text is only scanned once. New text rules go here.
+GARBAGE_PATTERN = re.compile("|".join([re.escape(term) for term in BAD_WORDS + PRANK_COMBOS] + [GIBBERISH]))
+
+# A real US number with or without the leading 1, ignoring any punctuation
+# around or between the digits: 1?[2-9][0-9]{9} once the non-digits are
+# dropped. ASCII digits only: numbers typed in other scripts (e.g.
+# Arabic-Indic) are rejected rather than dialed.
+VALID_PHONE = re.compile(r'\D*(?:1\D*)?[2-9](?:\D*[0-9]){9}\D*')
+
 # --- 2. THE SCRUBBING ENGINE ---
-def is_garbage_row(row):
-    """Scans the entire row for pranks, gibberish, or bad formatting."""
-    # Combine the whole row into one string for a deep scan
-    full_row_text = " ".join(row.astype(str)).lower()
-    
-    # Check Blacklist
-    if any(word in full_row_text for word in BAD_WORDS):
-        return True
-    
-    # Check Prank Combos
-    if any(combo in full_row_text for combo in PRANK_COMBOS):
-        return True
-        
-    # Check for Gibberish (6+ consonants in a row like 'asdfghj')
-    if re.search(r'[bcdfghjklmnpqrstvwxyz]{6,}', full_row_text):
-        return True
-        
-    return False
+def find_garbage_rows(df):
+    """Scans every row for pranks, gibberish, or bad formatting."""
+    # Combine each row into one lower-cased string for a deep scan
+    full_row_text = df.astype(str).agg(" ".join, axis=1).str.lower()
+    return full_row_text.str.contains(GARBAGE_PATTERN)
 
 def validate_phones(df):
     """Finds phone column and flags fakes like 123-456-7890."""
     phone_col = next((c for c in df.columns if 'phone' in c.lower() or 'cell' in c.lower()), None)
     if not phone_col:
-        return pd.Series([False] * len(df))
+        return pd.Series([False] * len(df), index=df.index)
     
-    def is_bad_number(phone):
-        digits = re.sub(r'\D', '', str(phone))
-        if len(digits) == 11 and digits.startswith('1'): digits = digits[1:]
-        if len(digits) != 10: return True
-        # Area code check: Fakes often start with 0, 1, or 123
-        if digits[0] in ['0', '1'] or digits.startswith('123'): return True
-        return False
-        
-    return df[phone_col].apply(is_bad_number)
-
-# --- 3. THE UI WORKFLOW ---
-uploaded_file = st.file_uploader("Step 1: Upload Master Lead List (CSV)", type=["csv"])
+    # One pass over the raw text: optional leading 1, then 10 digits whose
+    # area code can't start with 0 or 1 (fakes often start with 0, 1, or 123)
+    return ~df[phone_col].astype(str).str.fullmatch(VALID_PHONE)
 
-if uploaded_file:
-    df = pd.read_csv(uploaded_file)
+# --- 3. THE CACHED AUDIT ---
+# Streamlit reruns the script on every widget click; these only recompute
+# when a different file is uploaded. The cache is shared by every session for
+# the life of the process, so only the most recent uploads are kept. They are
+# keyed on a digest of the upload (the leading underscore tells Streamlit not
+# to re-hash the raw bytes).
+@st.cache_data(max_entries=8)
+def audit_leads(file_key, _file_bytes):
+    """Loads the uploaded CSV and returns its gold rows plus the total scanned."""
+    # Read every column as text: skips type inference and keeps phones,
+    # zips, etc. exactly as typed (no 3525551234.0 floats when a cell is blank)
+    df = pd.read_csv(io.BytesIO(_file_bytes), dtype=str)
     
-    # Run the filters
-    is_prank_row = df.apply(is_garbage_row, axis=1)
-    is_bad_phone = validate_phones(df)
+    # Run the filters: Row is garbage if it has a bad phone OR is a prank.
+    # The phone check is cheap, so only rows that pass it get the deep scan.
+    garbage_mask = validate_phones(df)
+    needs_scan = ~garbage_mask
+    if needs_scan.any():
+        garbage_mask[needs_scan] = find_garbage_rows(df[needs_scan]).to_numpy()
     
-    # Combine masks: Row is garbage if it's a prank OR has a bad phone
-    garbage_mask = is_prank_row | is_bad_phone
-    gold_df = df[~garbage_mask].copy()
+    # Split out the gold rows once here, so reruns and the export reuse them
+    return df[~garbage_mask], len(df)
+
+@st.cache_data(max_entries=8)
+def build_gold_csv(file_key, _file_bytes):
+    """Renders the gold list as downloadable CSV bytes."""
+    gold_df, _ = audit_leads(file_key, _file_bytes)
+    
+    # Convert Gold DF to CSV, encoding straight into a byte buffer
+    csv_buffer = io.BytesIO()
+    gold_df.to_csv(csv_buffer, index=False, encoding='utf-8')
+    return csv_buffer.getvalue()
+
+# --- 4. THE UI WORKFLOW ---
+uploaded_file = st.file_uploader("Step 1: Upload Master Lead List (CSV)", type=["csv"])
+
+if uploaded_file:
+    file_bytes = uploaded_file.getvalue()
+    file_key = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+    gold_df, leads_scanned = audit_leads(file_key, file_bytes)
+    garbage_count = leads_scanned - len(gold_df)
 
     # --- RESULTS DASHBOARD ---
     st.divider()
     st.subheader("📊 Audit Diagnostic Results")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Leads Scanned", len(df))
-    col2.metric("Garbage Removed", garbage_mask.sum(), delta_color="inverse")
+    col1.metric("Leads Scanned", leads_scanned)
+    col2.metric("Garbage Removed", garbage_count, delta_color="inverse")
     col3.metric("Verified Gold", len(gold_df))
 
-    st.success(f"Audit Complete! We protected your brand by removing {garbage_mask.sum()} risky or fake leads.")
+    st.success(f"Audit Complete! We protected your brand by removing {garbage_count} risky or fake leads.")
 
     # --- THE DOWNLOAD BUTTON ---
     st.divider()
     st.subheader("Step 2: Download Your Gold List")
     
-    # Convert Gold DF to CSV
-    csv_data = gold_df.to_csv(index=False).encode('utf-8')
-    
     st.download_button(
         label="📥 Download Cleaned CSV (All Columns Preserved)",
-        data=csv_data,
+        data=build_gold_csv(file_key, file_bytes),
         file_name=f"Gold_List_{datetime.now().strftime('%Y%m%d')}.csv",
         mime="text/csv",
     )